@@ -1,5 +1,7 @@
 """Instagram API endpoints configuration"""
 
+import re
+
 class Endpoints:
     """Instagram API endpoints"""
     
@@ -7,9 +9,13 @@ class Endpoints:
     
     # Authentication
     LOGIN_PAGE = f"{BASE_URL}/accounts/login/"
-    LOGIN_AJAX = "**/api/v1/web/accounts/login/ajax/"
+    # Login POST, as a regex so responses are matched without re-globbing the URL
+    LOGIN_AJAX = re.compile(r'/api/v1/web/accounts/login/ajax/?(?:\?|$)')
     
     # GraphQL endpoints
     GRAPHQL_QUERY = f"{BASE_URL}/graphql/query"
     GRAPHQL_PATTERN = "**/graphql/query"
-    API_GRAPHQL_PATTERN = "**/api/graphql"
\ No newline at end of file
+    API_GRAPHQL_PATTERN = "**/api/graphql"
+    
+    # REST API endpoints
+    FOLLOWING = f"{BASE_URL}/api/v1/friendships/{{user_id}}/following/"
\ No newline at end of file
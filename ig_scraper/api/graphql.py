@@ -1,18 +1,54 @@
 """Instagram GraphQL API handler"""
 
-import json
 from typing import Dict, Any, Optional
 from urllib.parse import urlencode
 from .endpoints import Endpoints
+from ..utils import dumps, preview, ResponseCache
+
+
+# Browser-side POST, parameterized so the script is never rebuilt per request
+_POST_JS = """
+    async ({url, headers, body}) => {
+        try {
+            const response = await fetch(url, {
+                method: 'POST',
+                headers: headers,
+                body: body,
+                credentials: 'include'
+            });
+            
+            const text = await response.text();
+            let data;
+            try {
+                data = JSON.parse(text);
+            } catch {
+                data = {error: 'Could not parse response', text: text};
+            }
+            
+            return {
+                status: response.status,
+                data: data
+            };
+        } catch (error) {
+            return {
+                status: 0,
+                error: error.toString()
+            };
+        }
+    }
+"""
 
 
 class GraphQLClient:
     """Handle Instagram GraphQL requests"""
     
-    def __init__(self, page, saved_metadata: Optional[Dict[str, Any]] = None):
+    def __init__(self, page, saved_metadata: Optional[Dict[str, Any]] = None,
+                 cache: Optional[ResponseCache] = None):
         self.page = page
         self.base_url = Endpoints.GRAPHQL_QUERY
         self.saved_metadata = saved_metadata or {}
+        # Opt-in: login checks must always hit the network, plain lookups can be cached
+        self.cache = cache
         
     def get_browser_headers(self) -> Dict[str, str]:
         """Extract headers from current browser context or use saved ones"""
@@ -30,12 +66,7 @@ class GraphQLClient:
             user_agent = self.page.evaluate("navigator.userAgent")
         
         # Get current csrftoken from cookies (this changes)
-        cookies = self.page.context.cookies()
-        csrf_token = None
-        for cookie in cookies:
-            if cookie['name'] == 'csrftoken':
-                csrf_token = cookie['value']
-                break
+        csrf_token = next((c['value'] for c in self.page.context.cookies(Endpoints.BASE_URL) if c['name'] == 'csrftoken'), None)
         
         return {
             "accept": "*/*",
@@ -62,10 +93,6 @@ class GraphQLClient:
     def get_profile_info(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get profile information using GraphQL"""
         
-        # No need to navigate again, we're already on Instagram
-        # Just wait a bit to ensure page is stable
-        self.page.wait_for_timeout(1000)
-        
         # Prepare GraphQL request parameters
         # Try to use saved doc_id first
         doc_id = None
@@ -91,10 +118,18 @@ class GraphQLClient:
             "__relay_internal__pv__PolarisCASB976ProfileEnabledrelayprovider": False
         }
         
+        variables_json = dumps(variables)
+        cache_key = ("profile", doc_id, variables_json)
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                print("✓ Profile loaded from cache")
+                return cached
+        
         # Build request body
         body_params = {
             "doc_id": doc_id,
-            "variables": json.dumps(variables),
+            "variables": variables_json,
             "fb_api_caller_class": "RelayModern",
             "fb_api_req_friendly_name": "PolarisProfilePageContentQuery",
             "server_timestamps": "true"
@@ -127,40 +162,11 @@ class GraphQLClient:
         
         # Make the request using page.evaluate to use browser's fetch
         try:
-            response = self.page.evaluate(f"""
-                (async () => {{
-                    const url = {json.dumps(self.base_url)};
-                    const headers = {json.dumps(headers)};
-                    const body = {json.dumps(body)};
-                    
-                    try {{
-                        const response = await fetch(url, {{
-                            method: 'POST',
-                            headers: headers,
-                            body: body,
-                            credentials: 'include'
-                        }});
-                        
-                        const text = await response.text();
-                        let data;
-                        try {{
-                            data = JSON.parse(text);
-                        }} catch {{
-                            data = {{error: 'Could not parse response', text: text}};
-                        }}
-                        
-                        return {{
-                            status: response.status,
-                            data: data
-                        }};
-                    }} catch (error) {{
-                        return {{
-                            status: 0,
-                            error: error.toString()
-                        }};
-                    }}
-                }})()
-            """)
+            response = self.page.evaluate(_POST_JS, {
+                'url': self.base_url,
+                'headers': headers,
+                'body': body
+            })
             
             print(f"Response Status: {response.get('status', 'Unknown')}")
             
@@ -170,11 +176,14 @@ class GraphQLClient:
             
             if response['status'] == 200:
                 print("✓ Request successful!")
+                # GraphQL errors (e.g. a stale doc_id) also come back as 200, never cache those
+                if self.cache and self.extract_username(response['data']):
+                    self.cache.set(cache_key, response['data'])
                 return response['data']
             else:
                 print(f"✗ Request failed with status: {response['status']}")
                 if response.get('data'):
-                    print(f"Response: {json.dumps(response['data'], indent=2)[:500]}")
+                    print(f"Response: {preview(response['data'], limit=500)}")
                 return None
                 
         except Exception as e:
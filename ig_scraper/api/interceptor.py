@@ -1,10 +1,10 @@
 """GraphQL request interceptor for Instagram"""
 
-import json
 import re
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable
 from urllib.parse import parse_qs
 from .endpoints import Endpoints
+from ..utils import loads
 
 
 class GraphQLInterceptor:
@@ -19,7 +19,7 @@ class GraphQLInterceptor:
         self.doc_ids = {}
         
     def setup_interception(self, page):
-        """Setup request/response interception on page"""
+        """Setup request interception on page"""
         
         # Intercept requests to capture headers and body
         def handle_request(request):
@@ -59,7 +59,7 @@ class GraphQLInterceptor:
                                     self.profile_query_info = {
                                         'doc_id': doc_id,
                                         'friendly_name': friendly_name,
-                                        'variables_template': json.loads(variables) if variables else {}
+                                        'variables_template': loads(variables) if variables else {}
                                     }
                         
                         # Store full request info
@@ -76,40 +76,34 @@ class GraphQLInterceptor:
                     # Silently handle errors to not break navigation
                     pass
         
-        # Intercept responses to get user data
-        def handle_response(response):
-            # Check if this is a GraphQL response
-            if any(pattern in response.url for pattern in ['graphql/query', '/api/graphql']):
-                try:
-                    if response.status == 200:
-                        # Try to get response body for user info
-                        response_body = response.json()
-                        
-                        # Check if this response contains user data
-                        if response_body and 'data' in response_body:
-                            data = response_body['data']
-                            
-                            # Look for user info in various places
-                            if 'user' in data:
-                                user = data['user']
-                                if 'id' in user or 'pk' in user:
-                                    print(f"  → Found user data: {user.get('username', 'unknown')}")
-                            
-                            if 'viewer' in data and 'user' in data['viewer']:
-                                viewer = data['viewer']['user']
-                                if 'id' in viewer or 'pk' in viewer:
-                                    print(f"  → Found viewer data: ID {viewer.get('id', viewer.get('pk'))}")
-                                    
-                except Exception:
-                    # Silently handle errors
-                    pass
-        
         # Set up listeners
+        # Requests only: doc_ids and headers are all on the outgoing request,
+        # so response bodies never have to be pulled back from the browser
         page.on('request', handle_request)
-        page.on('response', handle_response)
         
         print("GraphQL interceptor activated")
     
+    def wait_for_endpoints(self, page, names: Optional[Iterable[str]] = None, timeout: int = 3000) -> bool:
+        """Wait until the named queries (default: a profile query) are captured
+        
+        Polls in short slices so the page keeps dispatching request events,
+        returning as soon as everything is captured instead of sleeping out the timeout.
+        """
+        names = set(names or ())
+        
+        def captured():
+            if names:
+                return names.issubset(self.doc_ids)
+            return self.profile_query_info is not None
+        
+        waited = 0
+        while not captured():
+            if waited >= timeout:
+                return False
+            page.wait_for_timeout(100)
+            waited += 100
+        return True
+    
     def get_session_data(self) -> Dict[str, Any]:
         """Get all captured data for saving to session"""
         return {
@@ -1,10 +1,10 @@
 """Session management for Instagram authentication"""
 
 import os
-import json
 from pathlib import Path
 from typing import Optional, Dict, Any
 from datetime import datetime
+from ..utils import load_json, write_json, ResponseCache
 
 
 class SessionManager:
@@ -21,9 +21,26 @@ class SessionManager:
         """Get storage state file path for a user"""
         return str(self.states_dir / f"{username}_state.json")
     
+    def get_info_path(self, username: str) -> str:
+        """Get session info file path for a user"""
+        return str(self.base_dir / f"{username}_info.json")
+    
+    def get_graphql_cache(self, username: str) -> ResponseCache:
+        """Get the user's GraphQL response cache, kept next to the session files"""
+        return ResponseCache(self.base_dir / "graphql_cache" / username, ttl=600)
+    
+    def get_following_cache(self, username: str) -> ResponseCache:
+        """Get the user's following-page cache, kept next to the session files"""
+        return ResponseCache(self.base_dir / "following_cache" / username, ttl=600)
+    
+    def clear_response_caches(self, username: str):
+        """Drop cached responses that belong to the user's current session"""
+        self.get_graphql_cache(username).clear()
+        self.get_following_cache(username).clear()
+    
     def save_session_info(self, username: str, data: Dict[str, Any], graphql_data: Optional[Dict[str, Any]] = None):
         """Save additional session information including GraphQL metadata"""
-        info_path = self.base_dir / f"{username}_info.json"
+        info_path = self.get_info_path(username)
         data['last_saved'] = datetime.now().isoformat()
         data['username'] = username
         
@@ -32,24 +49,21 @@ class SessionManager:
             data['graphql'] = graphql_data
             print(f"  → Saved {len(graphql_data.get('doc_ids', {}))} GraphQL endpoints")
         
-        with open(info_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        write_json(info_path, data)
         
         print(f"✓ Session info saved for {username}")
     
     def load_session_info(self, username: str) -> Optional[Dict[str, Any]]:
-        """Load session information if it exists"""
-        info_path = self.base_dir / f"{username}_info.json"
+        """Load session information if it exists (re-parsed only when the file changes)"""
+        info_path = Path(self.get_info_path(username))
         
         if info_path.exists():
-            with open(info_path, 'r') as f:
-                return json.load(f)
+            return load_json(info_path)
         return None
     
     def has_saved_session(self, username: str) -> bool:
         """Check if a saved session exists for the user"""
-        state_file = Path(self.get_state_path(username))
-        return state_file.exists()
+        return Path(self.get_state_path(username)).exists()
     
     def create_browser_context(self, browser, username: str):
         """Create a browser context with storage state persistence"""
@@ -93,8 +107,11 @@ class SessionManager:
             state_path.unlink()
         
         # Remove info file
-        info_path = self.base_dir / f"{username}_info.json"
+        info_path = Path(self.get_info_path(username))
         if info_path.exists():
             info_path.unlink()
         
+        # Cached responses belong to the old session
+        self.clear_response_caches(username)
+        
         print(f"✓ Session cleared for {username}")
\ No newline at end of file
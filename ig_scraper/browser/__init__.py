@@ -1 +1,7 @@
-"""Browser automation module"""
\ No newline at end of file
+"""Browser automation module"""
+
+from .manager import BrowserManager
+from .pool import ContextPool
+from .routing import block_heavy_resources
+
+__all__ = ['BrowserManager', 'ContextPool', 'block_heavy_resources']
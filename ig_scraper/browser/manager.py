@@ -0,0 +1,50 @@
+"""Shared browser lifecycle management"""
+
+from playwright.sync_api import sync_playwright
+
+
+class BrowserManager:
+    """Launch Chromium once and share it across menu actions"""
+    
+    # Keep a headed browser responsive while its window is in the background
+    LAUNCH_ARGS = [
+        '--disable-background-timer-throttling',
+        '--disable-backgrounding-occluded-windows',
+        '--disable-renderer-backgrounding',
+    ]
+    
+    def __init__(self, headless: bool = False):
+        self.headless = headless
+        self._playwright = None
+        self._browser = None
+    
+    def get_browser(self):
+        """Return the shared browser, launching it on first use"""
+        # The window may have been closed by hand between menu actions
+        if self._browser is not None and not self._browser.is_connected():
+            print('⚠ Browser was closed, relaunching...')
+            self._browser = None
+        
+        if self._browser is None:
+            if self._playwright is None:
+                self._playwright = sync_playwright().start()
+            print('Starting browser...')
+            self._browser = self._playwright.chromium.launch(
+                headless=self.headless,
+                args=self.LAUNCH_ARGS
+            )
+        return self._browser
+    
+    def shutdown(self):
+        """Close the browser and stop Playwright"""
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+            print('Browser closed')
+        
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
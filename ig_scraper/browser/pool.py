@@ -0,0 +1,90 @@
+"""Per-account browser context pool"""
+
+import time
+from collections import OrderedDict
+
+from .routing import block_heavy_resources
+
+
+class ContextPool:
+    """Keep one live context per username on the shared browser"""
+    
+    def __init__(self, browser_manager, session_manager, max_contexts: int = 4,
+                 block_resources: bool = True):
+        self.browser_manager = browser_manager
+        self.session_manager = session_manager
+        self.max_contexts = max_contexts
+        # Pooled contexts only run session checks and API calls, so skip heavy assets
+        self.block_resources = block_resources
+        # username -> (browser, context), least recently used first
+        self._contexts = OrderedDict()
+        # username -> (page, last used timestamp)
+        self._pages = {}
+    
+    def acquire(self, username: str):
+        """Return the context for a user, creating it from saved state if needed"""
+        browser = self.browser_manager.get_browser()
+        
+        entry = self._contexts.get(username)
+        if entry and entry[0] is browser:
+            self._contexts.move_to_end(username)
+            return entry[1]
+        
+        # Contexts from a previous browser process died with it
+        self._contexts.pop(username, None)
+        self._pages.pop(username, None)
+        
+        context = self.session_manager.create_browser_context(browser, username)
+        if self.block_resources:
+            block_heavy_resources(context)
+        self._contexts[username] = (browser, context)
+        
+        if len(self._contexts) > self.max_contexts:
+            oldest_user, (_, oldest) = self._contexts.popitem(last=False)
+            self._pages.pop(oldest_user, None)
+            self._close(oldest)
+        return context
+    
+    def get_page(self, username: str, max_idle: int = 60):
+        """Return (context, page, recent) for a user, reusing the page left by the previous action
+        
+        recent is True when that page was used within max_idle seconds, so callers
+        can skip navigating and re-checking the login state.
+        """
+        context = self.acquire(username)
+        
+        entry = self._pages.get(username)
+        if entry and not entry[0].is_closed():
+            page, last_used = entry
+            return context, page, time.time() - last_used < max_idle
+        
+        page = context.new_page()
+        self._pages[username] = (page, 0)
+        return context, page, False
+    
+    def touch(self, username: str):
+        """Mark the user's page as just used"""
+        entry = self._pages.get(username)
+        if entry:
+            self._pages[username] = (entry[0], time.time())
+    
+    def discard(self, username: str):
+        """Close a user's context so the next acquire reloads the saved state"""
+        self._pages.pop(username, None)
+        entry = self._contexts.pop(username, None)
+        if entry:
+            self._close(entry[1])
+    
+    def close_all(self):
+        """Close every pooled context"""
+        self._pages.clear()
+        while self._contexts:
+            _, (_, context) = self._contexts.popitem()
+            self._close(context)
+    
+    @staticmethod
+    def _close(context):
+        try:
+            context.close()
+        except Exception:
+            pass
@@ -0,0 +1,22 @@
+"""Request routing helpers for browser contexts"""
+
+import re
+
+# Heavy assets by file extension (query strings allowed). Only matching URLs are
+# routed, so page-critical requests never wait on the Python side, which with the
+# sync API only serves routes while inside a Playwright call
+BLOCKED_ASSET_RE = re.compile(r'\.(?:png|jpe?g|webp|gif|mp4|woff2?)(?:\?|$)', re.I)
+
+# Third-party analytics and ad beacons
+BLOCKED_TRACKER_RE = re.compile(r'google-analytics|googletagmanager|doubleclick|facebook\.com/tr')
+
+
+def _abort_route(route):
+    """Abort a matched request"""
+    route.abort()
+
+
+def block_heavy_resources(context):
+    """Stop a context from downloading images, media, fonts and trackers"""
+    context.route(BLOCKED_ASSET_RE, _abort_route)
+    context.route(BLOCKED_TRACKER_RE, _abort_route)
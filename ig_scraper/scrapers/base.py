@@ -0,0 +1,94 @@
+"""Shared plumbing for the Instagram scrapers"""
+
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Mapping
+from ..api import Endpoints, GraphQLClient
+
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+DEFAULT_APP_ID = "936619743392459"
+
+
+class BaseScraper:
+    """Cookie, header and login-check helpers shared by the scrapers"""
+    
+    # Per-endpoint static headers; user-agent and x-ig-app-id are added from saved metadata
+    STATIC_HEADERS: Mapping[str, str] = MappingProxyType({})
+    
+    def __init__(self, page, session_manager, username: str):
+        self.page = page
+        self.session_manager = session_manager
+        self.username = username
+        self._cookie_cache = None
+        self._base_headers = None
+    
+    def _get_graphql_metadata(self) -> Optional[Dict[str, Any]]:
+        """GraphQL metadata captured at login, if any"""
+        saved_info = self.session_manager.load_session_info(self.username)
+        if saved_info and 'graphql' in saved_info:
+            return saved_info['graphql']
+        return None
+    
+    def _get_base_headers(self) -> Mapping[str, str]:
+        """Static request headers, built from saved GraphQL metadata on first use"""
+        if self._base_headers is None:
+            graphql_data = self._get_graphql_metadata() or {}
+            self._base_headers = MappingProxyType({
+                **self.STATIC_HEADERS,
+                "user-agent": graphql_data.get('user_agent') or DEFAULT_USER_AGENT,
+                "x-ig-app-id": graphql_data.get('app_id') or DEFAULT_APP_ID,
+            })
+        return self._base_headers
+    
+    def _cookie_map(self) -> Dict[str, str]:
+        """Map cookie names to values with a single cookies() call"""
+        return {c['name']: c['value'] for c in self.page.context.cookies(Endpoints.BASE_URL)}
+    
+    def _refresh_cookies(self):
+        """Re-read the cookie jar from the browser into the cache"""
+        self._cookie_cache = self._cookie_map()
+    
+    def _get_cookie(self, name: str) -> Optional[str]:
+        """Get a cookie value, reading the cookie jar only on first use"""
+        if self._cookie_cache is None:
+            self._refresh_cookies()
+        return self._cookie_cache.get(name)
+    
+    def verify_login_with_graphql(self) -> bool:
+        """Verify we're still logged in using GraphQL test"""
+        try:
+            print("\n" + "="*50)
+            print("VERIFYING LOGIN STATUS")
+            print("="*50)
+            
+            # Get user ID from cookies (refreshes the cache used by the scrape requests)
+            self._refresh_cookies()
+            user_id = self._get_cookie('ds_user_id')
+            
+            if not user_id:
+                print("✗ No user ID found in cookies")
+                return False
+            
+            print(f"User ID: {user_id}")
+            
+            # Load saved GraphQL metadata
+            graphql_metadata = self._get_graphql_metadata()
+            if graphql_metadata:
+                print(f"Using saved GraphQL metadata")
+            
+            # Create GraphQL client and test
+            graphql_client = GraphQLClient(self.page, graphql_metadata)
+            response_data = graphql_client.get_profile_info(user_id)
+            
+            if response_data:
+                username_from_api = graphql_client.extract_username(response_data)
+                if username_from_api:
+                    print(f"✓ Login verified! Username: {username_from_api}")
+                    return True
+            
+            print("✗ Could not verify login status")
+            return False
+            
+        except Exception as e:
+            print(f"✗ Error verifying login: {e}")
+            return False
@@ -1,84 +1,99 @@
 """Explore search scraper for Instagram"""
 
-import json
 import uuid
 import os
+import secrets
+import queue
+import threading
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, Any, Optional, List
-from ..api import Endpoints, GraphQLClient
+from ..utils import write_json
+from .base import BaseScraper
 
 
-class ExploreScraper:
+# Browser-side fetch, parameterized so the script is never rebuilt per request
+_FETCH_JS = """
+    async ({url, headers}) => {
+        const response = await fetch(url, {
+            method: 'GET',
+            headers: headers,
+            credentials: 'include'
+        });
+        
+        const data = await response.json();
+        return {
+            status: response.status,
+            data: data
+        };
+    }
+"""
+
+
+class ExploreScraper(BaseScraper):
     """Scrape explore/search results from Instagram"""
     
+    STATIC_HEADERS = MappingProxyType({
+        "accept": "*/*",
+        "accept-language": "en-GB,en;q=0.9,it-IT;q=0.8,it;q=0.7,en-US;q=0.6",
+        "cache-control": "no-cache",
+        "pragma": "no-cache",
+        "priority": "u=1, i",
+        "sec-ch-prefers-color-scheme": "light",
+        "sec-ch-ua": '"Not;A=Brand";v="99", "Google Chrome";v="139", "Chromium";v="139"',
+        "sec-ch-ua-full-version-list": '"Not;A=Brand";v="99.0.0.0", "Google Chrome";v="139.0.7258.128", "Chromium";v="139.0.7258.128"',
+        "sec-ch-ua-mobile": "?0",
+        "sec-ch-ua-model": '""',
+        "sec-ch-ua-platform": '"Windows"',
+        "sec-ch-ua-platform-version": '"19.0.0"',
+        "sec-fetch-dest": "empty",
+        "sec-fetch-mode": "cors",
+        "sec-fetch-site": "same-origin",
+        "x-asbd-id": "359341",
+        "x-requested-with": "XMLHttpRequest"
+    })
+    
     def __init__(self, page, session_manager, username: str):
-        self.page = page
-        self.session_manager = session_manager
-        self.username = username
+        super().__init__(page, session_manager, username)
         self.rank_token = str(uuid.uuid4())  # Generate unique rank token for session
         self.search_session_id = str(uuid.uuid4())  # Generate search session ID
         
-        # Create directory for saving data
+        # Directory for saving data, created on first save
         self.data_dir = Path("scraped_data") / "explore" / datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self._data_dir_created = False
         
-    def verify_login_with_graphql(self) -> bool:
-        """Verify we're still logged in using GraphQL test"""
-        try:
-            print("\n" + "="*50)
-            print("VERIFYING LOGIN STATUS")
-            print("="*50)
-            
-            # Get user ID from cookies
-            cookies = self.page.context.cookies()
-            user_id = None
-            for cookie in cookies:
-                if cookie['name'] == 'ds_user_id':
-                    user_id = cookie['value']
-                    break
-            
-            if not user_id:
-                print("✗ No user ID found in cookies")
-                return False
-            
-            print(f"User ID: {user_id}")
-            
-            # Load saved GraphQL metadata
-            saved_info = self.session_manager.load_session_info(self.username)
-            graphql_metadata = None
-            if saved_info and 'graphql' in saved_info:
-                graphql_metadata = saved_info['graphql']
-                print(f"Using saved GraphQL metadata")
-            
-            # Create GraphQL client and test
-            graphql_client = GraphQLClient(self.page, graphql_metadata)
-            response_data = graphql_client.get_profile_info(user_id)
-            
-            if response_data:
-                username_from_api = graphql_client.extract_username(response_data)
-                if username_from_api:
-                    print(f"✓ Login verified! Username: {username_from_api}")
-                    return True
-            
-            print("✗ Could not verify login status")
-            return False
-            
-        except Exception as e:
-            print(f"✗ Error verifying login: {e}")
-            return False
+        # Files are written by a background thread (started on the first save)
+        # so disk I/O overlaps the next request
+        self._save_queue = queue.Queue()
+        self._save_thread = None
+    
+    def _save_worker(self):
+        """Write queued pages to disk until a None sentinel is received"""
+        while True:
+            job = self._save_queue.get()
+            if job is None:
+                break
+            try:
+                self._write_page_files(*job)
+            except Exception as e:
+                print(f"  ⚠ Error saving data: {e}")
+    
+    def close(self):
+        """Flush pending writes and stop the background writer"""
+        if self._save_thread is None:
+            return
+        self._save_queue.put(None)
+        self._save_thread.join()
+        self._save_thread = None
+        if self._data_dir_created:
+            print(f"\n  📁 All data saved to: {self.data_dir}")
     
     def search_explore(self, query: str, next_max_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Search in explore with a query"""
         try:
-            # Get csrf token from cookies
-            cookies = self.page.context.cookies()
-            csrf_token = None
-            
-            for cookie in cookies:
-                if cookie['name'] == 'csrftoken':
-                    csrf_token = cookie['value']
-                    break
+            # Get csrf token from cached cookies
+            csrf_token = self._get_cookie('csrftoken')
             
             # Build URL with parameters
             base_url = "https://www.instagram.com/api/v1/fbsearch/web/top_serp/"
@@ -112,72 +127,19 @@ class ExploreScraper:
                 print(f"Search session ID: {self.search_session_id}")
             print(f"Rank token: {self.rank_token}")
             
-            # Get saved metadata for headers
-            saved_info = self.session_manager.load_session_info(self.username)
-            user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            app_id = "936619743392459"
+            # Static headers are built once, only per-request values are overlaid
+            headers = {**self._get_base_headers(), "x-csrftoken": csrf_token}
             
-            if saved_info and 'graphql' in saved_info:
-                graphql_data = saved_info['graphql']
-                if graphql_data.get('user_agent'):
-                    user_agent = graphql_data['user_agent']
-                if graphql_data.get('app_id'):
-                    app_id = graphql_data['app_id']
-            
-            # Get x-ig-www-claim from cookies if available
-            x_ig_www_claim = None
-            for cookie in cookies:
-                if cookie['name'] == 'ig_www_claim':
-                    x_ig_www_claim = cookie['value']
-                    break
-            
-            # Build headers
-            headers = {
-                "accept": "*/*",
-                "accept-language": "en-GB,en;q=0.9,it-IT;q=0.8,it;q=0.7,en-US;q=0.6",
-                "cache-control": "no-cache",
-                "pragma": "no-cache",
-                "priority": "u=1, i",
-                "sec-ch-prefers-color-scheme": "light",
-                "sec-ch-ua": '"Not;A=Brand";v="99", "Google Chrome";v="139", "Chromium";v="139"',
-                "sec-ch-ua-full-version-list": '"Not;A=Brand";v="99.0.0.0", "Google Chrome";v="139.0.7258.128", "Chromium";v="139.0.7258.128"',
-                "sec-ch-ua-mobile": "?0",
-                "sec-ch-ua-model": '""',
-                "sec-ch-ua-platform": '"Windows"',
-                "sec-ch-ua-platform-version": '"19.0.0"',
-                "sec-fetch-dest": "empty",
-                "sec-fetch-mode": "cors",
-                "sec-fetch-site": "same-origin",
-                "user-agent": user_agent,
-                "x-asbd-id": "359341",
-                "x-csrftoken": csrf_token,
-                "x-ig-app-id": app_id,
-                "x-requested-with": "XMLHttpRequest"
-            }
-            
-            # Add x-ig-www-claim if available
+            # Add x-ig-www-claim from cookies if available
+            x_ig_www_claim = self._get_cookie('ig_www_claim')
             if x_ig_www_claim:
                 headers["x-ig-www-claim"] = x_ig_www_claim
             
             # Add x-web-session-id (generate a simple one)
-            headers["x-web-session-id"] = f"{uuid.uuid4().hex[:6]}:{uuid.uuid4().hex[:6]}:{uuid.uuid4().hex[:6]}"
+            headers["x-web-session-id"] = f"{secrets.token_hex(3)}:{secrets.token_hex(3)}:{secrets.token_hex(3)}"
             
             # Make request using browser's fetch
-            response = self.page.evaluate(f"""
-                (async () => {{
-                    const response = await fetch("{full_url}", {{
-                        method: 'GET',
-                        headers: {json.dumps(headers)},
-                        credentials: 'include'
-                    }});
-                    
-                    const data = await response.json();
-                    return {{
-                        status: response.status,
-                        data: data
-                    }};
-                }})()
-            """)
+            response = self.page.evaluate(_FETCH_JS, {'url': full_url, 'headers': headers})
             
             print(f"\nResponse Status: {response['status']}")
             
@@ -196,88 +158,115 @@ class ExploreScraper:
             print(f"✗ Error in explore search: {e}")
             return None
     
+    def search_explore_all(self, query: str, max_pages: Optional[int] = None,
+                           delay_ms: int = 1000, next_max_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Fetch explore pages one after another until the results end or max_pages is reached
+        
+        Requests are paced by delay_ms. Pass next_max_id to continue from an already fetched page.
+        """
+        pages = []
+        
+        while max_pages is None or len(pages) < max_pages:
+            data = self.search_explore(query, next_max_id=next_max_id)
+            if not data:
+                break
+            
+            pages.append(data)
+            next_max_id = self.get_next_max_id(data)
+            print(f"  → Page {len(pages)} loaded")
+            if not next_max_id:
+                break
+            self.page.wait_for_timeout(delay_ms)
+        
+        print(f"\n✓ Fetched {len(pages)} pages")
+        return pages
+    
+    @staticmethod
+    def get_next_max_id(data: Dict[str, Any]) -> Optional[str]:
+        """Pagination cursor of a results page (in root or media_grid)"""
+        return data.get('next_max_id') or data.get('media_grid', {}).get('next_max_id')
+    
     def save_request_response(self, query: str, url: str, headers: Dict[str, Any], 
                              response_data: Dict[str, Any], next_max_id: Optional[str] = None):
-        """Save request and response to files"""
-        try:
-            # Generate filename based on query and pagination
-            safe_query = query.replace(' ', '_').replace('/', '_')[:20]
-            timestamp = datetime.now().strftime("%H%M%S")
-            
-            # Better page naming: first page or continuation with shortened ID
+        """Queue request and response to be saved to files"""
+        # Generate filename based on query and pagination
+        safe_query = query.replace(' ', '_').replace('/', '_')[:20]
+        now = datetime.now()
+        timestamp = now.strftime("%H%M%S")
+        
+        # Better page naming: first page or continuation with shortened ID
+        if next_max_id:
+            # For pagination pages, use a shortened version of the max_id
+            suffix = f"_page_{next_max_id[:8]}"
+        else:
+            suffix = "_page_01"
+        
+        base_name = f"{safe_query}_{timestamp}{suffix}"
+        
+        request_data = {
+            "timestamp": now.isoformat(),
+            "url": url,
+            "method": "GET",
+            "headers": headers,
+            "query": query,
+            "rank_token": self.rank_token,
+            "next_max_id": next_max_id
+        }
+        
+        if self._save_thread is None:
+            self._save_thread = threading.Thread(target=self._save_worker, daemon=True)
+            self._save_thread.start()
+        self._save_queue.put((base_name, query, request_data, response_data, next_max_id))
+        print(f"  → Saving req/res/summary files: {base_name}")
+    
+    def _write_page_files(self, base_name: str, query: str, request_data: Dict[str, Any],
+                          response_data: Dict[str, Any], next_max_id: Optional[str]):
+        """Write request, response and summary files for one page"""
+        if not self._data_dir_created:
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            self._data_dir_created = True
+        
+        # Save request info
+        write_json(self.data_dir / f"req_{base_name}.json", request_data)
+        
+        # Save response
+        write_json(self.data_dir / f"res_{base_name}.json", response_data)
+        
+        # Save summary
+        summary_file = self.data_dir / f"summary_{base_name}.txt"
+        with open(summary_file, 'w', encoding='utf-8') as f:
+            f.write(f"Explore Search Summary\n")
+            f.write(f"=" * 50 + "\n")
+            f.write(f"Query: {query}\n")
+            f.write(f"Timestamp: {request_data['timestamp']}\n")
+            f.write(f"Rank Token: {self.rank_token}\n")
             if next_max_id:
-                # For pagination pages, use a shortened version of the max_id
-                suffix = f"_page_{next_max_id[:8]}"
+                f.write(f"Page Type: Pagination\n")
+                f.write(f"Search Session ID: (empty)\n")
+                f.write(f"Previous max_id: {next_max_id}\n\n")
             else:
-                suffix = "_page_01"
-            
-            base_name = f"{safe_query}_{timestamp}{suffix}"
-            
-            # Save request info
-            request_file = self.data_dir / f"req_{base_name}.json"
-            request_data = {
-                "timestamp": datetime.now().isoformat(),
-                "url": url,
-                "method": "GET",
-                "headers": headers,
-                "query": query,
-                "rank_token": self.rank_token,
-                "next_max_id": next_max_id
-            }
-            
-            with open(request_file, 'w', encoding='utf-8') as f:
-                json.dump(request_data, f, indent=2, ensure_ascii=False)
-            
-            print(f"  → Request saved: {request_file.name}")
-            
-            # Save response
-            response_file = self.data_dir / f"res_{base_name}.json"
-            with open(response_file, 'w', encoding='utf-8') as f:
-                json.dump(response_data, f, indent=2, ensure_ascii=False)
-            
-            print(f"  → Response saved: {response_file.name}")
-            
-            # Save summary
-            summary_file = self.data_dir / f"summary_{base_name}.txt"
-            with open(summary_file, 'w', encoding='utf-8') as f:
-                f.write(f"Explore Search Summary\n")
-                f.write(f"=" * 50 + "\n")
-                f.write(f"Query: {query}\n")
-                f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-                f.write(f"Rank Token: {self.rank_token}\n")
-                if next_max_id:
-                    f.write(f"Page Type: Pagination\n")
-                    f.write(f"Search Session ID: (empty)\n")
-                    f.write(f"Previous max_id: {next_max_id}\n\n")
-                else:
-                    f.write(f"Page Type: Initial\n")
-                    f.write(f"Search Session ID: {self.search_session_id}\n\n")
-                
-                # Results summary
-                if 'list' in response_data:
-                    f.write(f"Search Results: {len(response_data['list'])} items\n")
-                    for item in response_data['list'][:10]:
-                        if 'user' in item:
-                            u = item['user']
-                            f.write(f"  - USER: @{u.get('username')} ({u.get('full_name')})\n")
-                
-                # Media grid summary  
-                if 'media_grid' in response_data and 'sections' in response_data.get('media_grid', {}):
-                    sections = response_data['media_grid']['sections']
-                    total_posts = sum(len(s.get('layout_content', {}).get('medias', [])) for s in sections)
-                    f.write(f"\nMedia Grid: {total_posts} posts in {len(sections)} sections\n")
-                
-                f.write(f"\nHas more results: {'Yes' if response_data.get('next_max_id') else 'No'}\n")
-                if response_data.get('has_more') is not None:
-                    f.write(f"Has more (explicit): {response_data['has_more']}\n")
-                if response_data.get('auto_load_more_enabled') is not None:
-                    f.write(f"Auto load more enabled: {response_data['auto_load_more_enabled']}\n")
-            
-            print(f"  → Summary saved: {summary_file.name}")
-            print(f"\n  📁 All data saved to: {self.data_dir}")
-            
-        except Exception as e:
-            print(f"  ⚠ Error saving data: {e}")
+                f.write(f"Page Type: Initial\n")
+                f.write(f"Search Session ID: {self.search_session_id}\n\n")
+            
+            # Results summary
+            if 'list' in response_data:
+                f.write(f"Search Results: {len(response_data['list'])} items\n")
+                for item in response_data['list'][:10]:
+                    if 'user' in item:
+                        u = item['user']
+                        f.write(f"  - USER: @{u.get('username')} ({u.get('full_name')})\n")
+            
+            # Media grid summary  
+            if 'media_grid' in response_data and 'sections' in response_data.get('media_grid', {}):
+                sections = response_data['media_grid']['sections']
+                total_posts = sum(len(s.get('layout_content', {}).get('medias', [])) for s in sections)
+                f.write(f"\nMedia Grid: {total_posts} posts in {len(sections)} sections\n")
+            
+            f.write(f"\nHas more results: {'Yes' if response_data.get('next_max_id') else 'No'}\n")
+            if response_data.get('has_more') is not None:
+                f.write(f"Has more (explicit): {response_data['has_more']}\n")
+            if response_data.get('auto_load_more_enabled') is not None:
+                f.write(f"Auto load more enabled: {response_data['auto_load_more_enabled']}\n")
     
     def display_results(self, data: Dict[str, Any]):
         """Display explore search results"""
@@ -1,160 +1,178 @@
 """Following scraper for Instagram"""
 
-import json
-from typing import Dict, Any, Optional, List
-from ..api import Endpoints, GraphQLClient
+import logging
+import random
+import sys
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Tuple
+from urllib.parse import urlencode
+from ..api import Endpoints
+from ..utils import loads, preview
+from .base import BaseScraper
 
+log = logging.getLogger(__name__)
 
-class FollowingScraper:
+# Rate-limit handling for the following endpoint
+_THROTTLE_STATUSES = {429, 500, 502, 503}
+_BACKOFF_BASE_MS = 2000
+_BACKOFF_CAP_MS = 60000
+
+# User fields shown by display_following with their missing-key defaults, in display order
+_USER_FIELDS = (('username', 'unknown'), ('full_name', 'N/A'), ('pk', 'N/A'),
+                ('is_private', False), ('is_verified', False), ('profile_pic_url', None))
+
+
+class FollowingScraper(BaseScraper):
     """Scrape following list from Instagram"""
     
-    def __init__(self, page, session_manager, username: str):
-        self.page = page
-        self.session_manager = session_manager
-        self.username = username
-        
-    def verify_login_with_graphql(self) -> bool:
-        """Verify we're still logged in using GraphQL test"""
-        try:
-            print("\n" + "="*50)
-            print("VERIFYING LOGIN STATUS")
-            print("="*50)
-            
-            # Get user ID from cookies
-            cookies = self.page.context.cookies()
-            user_id = None
-            for cookie in cookies:
-                if cookie['name'] == 'ds_user_id':
-                    user_id = cookie['value']
-                    break
-            
-            if not user_id:
-                print("✗ No user ID found in cookies")
-                return False
-            
-            print(f"User ID: {user_id}")
-            
-            # Load saved GraphQL metadata
-            saved_info = self.session_manager.load_session_info(self.username)
-            graphql_metadata = None
-            if saved_info and 'graphql' in saved_info:
-                graphql_metadata = saved_info['graphql']
-                print(f"Using saved GraphQL metadata")
-            
-            # Create GraphQL client and test
-            graphql_client = GraphQLClient(self.page, graphql_metadata)
-            response_data = graphql_client.get_profile_info(user_id)
-            
-            if response_data:
-                username_from_api = graphql_client.extract_username(response_data)
-                if username_from_api:
-                    print(f"✓ Login verified! Username: {username_from_api}")
-                    return True
-            
-            print("✗ Could not verify login status")
-            return False
-            
-        except Exception as e:
-            print(f"✗ Error verifying login: {e}")
-            return False
+    STATIC_HEADERS = MappingProxyType({
+        "accept": "*/*",
+        "accept-language": "en-GB,en;q=0.9",
+        "cache-control": "no-cache",
+        "pragma": "no-cache",
+        "priority": "u=1, i",
+        "sec-ch-prefers-color-scheme": "light",
+        "sec-ch-ua": '"Not;A=Brand";v="99", "Google Chrome";v="139", "Chromium";v="139"',
+        "sec-ch-ua-mobile": "?0",
+        "sec-ch-ua-platform": '"Windows"',
+        "sec-fetch-dest": "empty",
+        "sec-fetch-mode": "cors",
+        "sec-fetch-site": "same-origin",
+        "x-requested-with": "XMLHttpRequest"
+    })
+    
+    def __init__(self, page, session_manager, username: str, use_cache: bool = True,
+                 max_retries: int = 5):
+        super().__init__(page, session_manager, username)
+        self.max_retries = max_retries
+        # Retries and cache use of the last get_following call, read by get_following_all's pacing
+        self.last_retries = 0
+        self.last_cached = False
+        # Pages are cached briefly so re-runs after a crash or rate limit skip the network
+        self._cache = session_manager.get_following_cache(username) if use_cache else None
+        self._following_url_base = None
     
-    def get_following(self, count: int = 12, max_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    def get_following(self, count: int = 12, max_id: Optional[str] = None,
+                      _retry_auth: bool = True) -> Optional[Dict[str, Any]]:
         """Get following list"""
+        self.last_retries = 0
+        self.last_cached = False
         try:
-            # Get user ID from cookies
-            cookies = self.page.context.cookies()
-            user_id = None
-            csrf_token = None
-            
-            for cookie in cookies:
-                if cookie['name'] == 'ds_user_id':
-                    user_id = cookie['value']
-                elif cookie['name'] == 'csrftoken':
-                    csrf_token = cookie['value']
+            # Use cached cookies, only hitting the browser on first use
+            user_id = self._get_cookie('ds_user_id')
+            csrf_token = self._get_cookie('csrftoken')
             
             if not user_id:
                 print("✗ No user ID found")
                 return None
             
-            # Build URL
-            url = f"https://www.instagram.com/api/v1/friendships/{user_id}/following/"
-            params = f"?count={count}"
+            # Build URL: the prefix is formatted once, only the query string varies
+            if not self._following_url_base:
+                self._following_url_base = Endpoints.FOLLOWING.format(user_id=user_id) + "?"
+            params = {'count': count}
             if max_id:
-                params += f"&max_id={max_id}"
+                params['max_id'] = max_id
             
-            full_url = url + params
+            full_url = self._following_url_base + urlencode(params)
             
             print("\n" + "="*50)
             print("FETCHING FOLLOWING LIST")
             print("="*50)
-            print(f"URL: {full_url}")
-            print(f"User ID: {user_id}")
-            print(f"Count: {count}")
+            log.debug("URL: %s", full_url)
+            log.debug("User ID: %s", user_id)
+            log.debug("Count: %s", count)
             if max_id:
-                print(f"Max ID (pagination): {max_id}")
-            
-            # Get saved metadata for headers
-            saved_info = self.session_manager.load_session_info(self.username)
-            user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            app_id = "936619743392459"
-            
-            if saved_info and 'graphql' in saved_info:
-                graphql_data = saved_info['graphql']
-                if graphql_data.get('user_agent'):
-                    user_agent = graphql_data['user_agent']
-                if graphql_data.get('app_id'):
-                    app_id = graphql_data['app_id']
-            
-            # Build headers
-            headers = {
-                "accept": "*/*",
-                "accept-language": "en-GB,en;q=0.9",
-                "cache-control": "no-cache",
-                "pragma": "no-cache",
-                "priority": "u=1, i",
-                "sec-ch-prefers-color-scheme": "light",
-                "sec-ch-ua": '"Not;A=Brand";v="99", "Google Chrome";v="139", "Chromium";v="139"',
-                "sec-ch-ua-mobile": "?0",
-                "sec-ch-ua-platform": '"Windows"',
-                "sec-fetch-dest": "empty",
-                "sec-fetch-mode": "cors",
-                "sec-fetch-site": "same-origin",
-                "user-agent": user_agent,
-                "x-csrftoken": csrf_token,
-                "x-ig-app-id": app_id,
-                "x-requested-with": "XMLHttpRequest"
-            }
-            
-            # Make request using browser's fetch
-            response = self.page.evaluate(f"""
-                (async () => {{
-                    const response = await fetch("{full_url}", {{
-                        method: 'GET',
-                        headers: {json.dumps(headers)},
-                        credentials: 'include'
-                    }});
-                    
-                    const data = await response.json();
-                    return {{
-                        status: response.status,
-                        data: data
-                    }};
-                }})()
-            """)
+                log.debug("Max ID (pagination): %s", max_id)
+            
+            cache_key = (user_id, count, max_id)
+            if self._cache:
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    print("✓ Loaded from cache")
+                    self.last_cached = True
+                    return cached
+            
+            # Static headers are built once, only the CSRF token varies
+            headers = {**self._get_base_headers(), "x-csrftoken": csrf_token}
+            
+            # Request through the context's APIRequestContext (shares the browser cookies),
+            # backing off exponentially while Instagram is throttling
+            while True:
+                response = self.page.request.get(full_url, headers=headers)
+                if response.status not in _THROTTLE_STATUSES or self.last_retries >= self.max_retries:
+                    break
+                
+                delay_ms = random.uniform(0, min(_BACKOFF_CAP_MS, _BACKOFF_BASE_MS * 2 ** self.last_retries))
+                self.last_retries += 1
+                print(f"⚠ Throttled (status {response.status}), retry {self.last_retries}/{self.max_retries} in {delay_ms / 1000:.1f}s...")
+                self.page.wait_for_timeout(delay_ms)
             
-            print(f"\nResponse Status: {response['status']}")
+            print(f"\nResponse Status: {response.status}")
             
-            if response['status'] == 200:
+            if response.status == 200:
                 print("✓ Request successful!")
-                return response['data']
+                data = loads(response.body())
+                if self._cache:
+                    self._cache.set(cache_key, data)
+                return data
+            elif response.status == 401 and _retry_auth:
+                # Cookies may have rotated, refresh them and retry once
+                print("⚠ Unauthorized, refreshing cookies and retrying...")
+                self._refresh_cookies()
+                return self.get_following(count=count, max_id=max_id, _retry_auth=False)
+            elif response.status == 400 and b'checkpoint' in response.body():
+                print("✗ Checkpoint required, complete it in the browser before scraping again")
+                return None
             else:
-                print(f"✗ Request failed with status: {response['status']}")
+                print(f"✗ Request failed with status: {response.status}")
                 return None
                 
         except Exception as e:
             print(f"✗ Error fetching following: {e}")
             return None
     
+    def get_following_all(self, count: int = 12, max_pages: Optional[int] = None,
+                          delay_ms: int = 1000, max_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Fetch following pages back-to-back until the list ends or max_pages is reached
+        
+        Pages are chained by next_max_id, so each request depends on the previous
+        response and cannot be issued concurrently; requests are paced by delay_ms,
+        which doubles whenever a page had to be retried because of throttling.
+        Pass max_id to continue from an already fetched page.
+        """
+        pages = []
+        total_users = 0
+        
+        while max_pages is None or len(pages) < max_pages:
+            data = self.get_following(count=count, max_id=max_id)
+            if not data:
+                break
+            
+            pages.append(data)
+            max_id, user_count, big_list = self.summarize_following(data)
+            total_users += user_count
+            print(f"  → Page {len(pages)}: {user_count} users (more pages: {'yes' if big_list else 'no'})")
+            if not max_id:
+                break
+            
+            # Cached pages made no request, so there is nothing to pace
+            if self.last_cached:
+                continue
+            
+            # Slow down for the rest of the run if this page was throttled
+            if self.last_retries:
+                delay_ms = min(delay_ms * 2, _BACKOFF_CAP_MS)
+                print(f"  → Throttling detected, pacing increased to {delay_ms / 1000:.1f}s")
+            self.page.wait_for_timeout(delay_ms)
+        
+        print(f"\n✓ Fetched {len(pages)} pages ({total_users} users)")
+        return pages
+    
+    @staticmethod
+    def summarize_following(data: Dict[str, Any]) -> Tuple[Optional[str], int, bool]:
+        """Return (next_max_id, user count, big_list) without walking the users"""
+        return data.get('next_max_id'), len(data.get('users', ())), bool(data.get('big_list'))
+    
     def display_following(self, data: Dict[str, Any]):
         """Display following list in console"""
         if not data:
@@ -180,17 +198,20 @@ class FollowingScraper:
         print("USERS:")
         print("-"*50)
         
-        for i, user in enumerate(users, 1):
-            print(f"\n{i}. @{user.get('username', 'unknown')}")
-            print(f"   Name: {user.get('full_name', 'N/A')}")
-            print(f"   ID: {user.get('pk', 'N/A')}")
-            print(f"   Private: {user.get('is_private', False)}")
-            print(f"   Verified: {user.get('is_verified', False)}")
-            if user.get('profile_pic_url'):
-                print(f"   Has profile pic: Yes")
-        
-        print("\n" + "="*50)
+        # Project only the displayed fields, then build and write the listing in one call
+        rows = [tuple(user.get(key, default) for key, default in _USER_FIELDS) for user in users]
+        lines = [
+            f"\n{i}. @{username}\n"
+            f"   Name: {full_name}\n"
+            f"   ID: {pk}\n"
+            f"   Private: {is_private}\n"
+            f"   Verified: {is_verified}"
+            + ("\n   Has profile pic: Yes" if pic else "")
+            for i, (username, full_name, pk, is_private, is_verified, pic) in enumerate(rows, 1)
+        ]
+        lines.append("\n" + "="*50 + "\n")
+        sys.stdout.write("\n".join(lines))
         
-        # Also save full response for debugging
-        print("\nFull response saved to console (first 1000 chars):")
-        print(json.dumps(data, indent=2)[:1000] + "...")
\ No newline at end of file
+        # Response dump only when debug logging is enabled
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Response preview (first 1000 chars):\n%s...", preview(data))
\ No newline at end of file
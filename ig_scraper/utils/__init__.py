@@ -0,0 +1,6 @@
+"""Shared utilities"""
+
+from .json_utils import dumps, loads, load_json, preview, write_json
+from .cache import ResponseCache
+
+__all__ = ['dumps', 'loads', 'load_json', 'preview', 'write_json', 'ResponseCache']
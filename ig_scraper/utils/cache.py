@@ -0,0 +1,52 @@
+"""Small on-disk cache for API responses"""
+
+import hashlib
+import time
+from pathlib import Path
+from typing import Any, Optional, Tuple, Union
+
+from .json_utils import loads, write_json
+
+
+class ResponseCache:
+    """JSON file cache keyed by a tuple of request parameters, with expiry"""
+    
+    def __init__(self, cache_dir: Union[str, Path], ttl: int = 600):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self._dir_created = False
+    
+    def _path(self, key: Tuple) -> Path:
+        """Map a key tuple to its cache file"""
+        digest = hashlib.md5("|".join(str(part) for part in key).encode()).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+    
+    def get(self, key: Tuple) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired"""
+        path = self._path(key)
+        try:
+            entry = loads(path.read_bytes())
+        except (FileNotFoundError, ValueError):
+            return None
+        
+        if entry.get('expires_at', 0) < time.time():
+            path.unlink(missing_ok=True)
+            return None
+        return entry.get('data')
+    
+    def set(self, key: Tuple, value: Any, ttl: Optional[int] = None):
+        """Store value under key for ttl seconds (defaults to the cache TTL)"""
+        if not self._dir_created:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._dir_created = True
+        
+        write_json(self._path(key), {
+            'expires_at': time.time() + (self.ttl if ttl is None else ttl),
+            'data': value
+        })
+    
+    def clear(self):
+        """Remove all cached entries"""
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
@@ -0,0 +1,75 @@
+"""JSON helpers with an optional orjson fast path"""
+
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to stdlib json
+    orjson = None
+
+
+def dumps(data: Any, indent: bool = False) -> str:
+    """Serialize data to a JSON string, optionally indented by 2 spaces"""
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, option=option).decode()
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False)
+
+
+def preview(data: Any, limit: int = 1000, max_items: int = 3, max_depth: int = 3) -> str:
+    """Indented JSON preview of at most limit chars
+    
+    Lists and strings are trimmed before serializing, down to max_depth levels,
+    and anything nested deeper is replaced by a placeholder, so long nested
+    lists are never serialized in full. Dict keys are kept, wide dicts cost
+    in proportion to their size.
+    """
+    return dumps(_trim(data, limit, max_items, max_depth), indent=True)[:limit]
+
+
+def _trim(value: Any, limit: int, max_items: int, depth: int) -> Any:
+    """Shorten lists and strings for previews, recursing up to depth levels"""
+    if isinstance(value, str):
+        return value[:limit]
+    if not isinstance(value, (dict, list)):
+        return value
+    if depth <= 0:
+        return '...'
+    if isinstance(value, dict):
+        return {key: _trim(item, limit, max_items, depth - 1) for key, item in value.items()}
+    return [_trim(item, limit, max_items, depth - 1) for item in value[:max_items]]
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document from str or bytes"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_json(path: Union[str, Path]) -> Any:
+    """Load a JSON file, re-parsing it only when its mtime changes
+    
+    The parsed object is shared between callers and must be treated as read-only.
+    """
+    path = str(path)
+    return _load_json_cached(path, os.stat(path).st_mtime_ns)
+
+
+@lru_cache(maxsize=32)
+def _load_json_cached(path: str, mtime_ns: int) -> Any:
+    """Parse a JSON file; mtime_ns is only part of the cache key"""
+    return loads(Path(path).read_bytes())
+
+
+def write_json(path: Union[str, Path], data: Any):
+    """Write data to path as indented UTF-8 JSON"""
+    if orjson:
+        Path(path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
@@ -1,13 +1,58 @@
-from playwright.sync_api import sync_playwright, TimeoutError
+from playwright.sync_api import TimeoutError
+import argparse
 import signal
 import sys
-import json
+import os
 import time
+import logging
+import re
+from contextlib import contextmanager
+from functools import partial
+from types import SimpleNamespace
 
 from ig_scraper.api import Endpoints, GraphQLClient, GraphQLInterceptor
 from ig_scraper.auth import SessionManager
-from ig_scraper.scrapers.following import FollowingScraper
-from ig_scraper.scrapers.explore import ExploreScraper
+from ig_scraper.browser import BrowserManager, ContextPool
+from ig_scraper.utils import dumps, loads
+
+log = logging.getLogger(__name__)
+
+CREDENTIALS_FILE = 'credentials.json'
+
+MENU_PROMPT = '\n1: Login\n2: Login with saved session\n3: Clear saved sessions\n4: First Automation (GraphQL test)\n5: Scrape Following\n6: Explore Search\n0: Exit\n> '
+
+# Login page selectors
+COOKIE_BANNER_SELECTOR = 'button._a9--._ap36._asz1'
+PASSWORD_INPUT_SELECTOR = 'input[name="password"]'
+LOGIN_SUBMIT_SELECTOR = '#loginForm button[type="submit"]'
+
+# Buttons Instagram shows right after login ("Save your login info?" and friends)
+POST_LOGIN_BUTTON_RE = re.compile(r'save info|not now|turn on', re.I)
+POST_LOGIN_FALLBACK_SELECTOR = 'section button'
+
+# Page cap for 'a' (load all remaining), so a bulk scrape always ends
+AUTO_PAGINATE_MAX_PAGES = 50
+
+# Console line plus the (label, response field) detail shown for each login outcome
+LOGIN_STATUS_INFO = {
+    'success': ('✓ Login successful!', 'User ID', 'userId'),
+    '2fa': ('⚠ Two-factor authentication required', None, None),
+    'checkpoint': ('⚠ Checkpoint challenge required', 'Checkpoint URL', 'checkpoint_url'),
+    'failed': ('✗ Login failed', 'Message', 'message'),
+}
+
+# Either element only renders for a logged-in user
+LOGGED_IN_SELECTOR = 'svg[aria-label="Profile"], span[role="link"][tabindex="0"]'
+
+# Fill both login fields in one round trip; the native setter keeps React's state in sync
+FILL_LOGIN_JS = """([username, password]) => {
+    const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+    for (const [name, value] of [['username', username], ['password', password]]) {
+        const input = document.querySelector(`input[name="${name}"]`);
+        setValue.call(input, value);
+        input.dispatchEvent(new Event('input', { bubbles: true }));
+    }
+}"""
 
 def signal_handler(sig, frame):
     print('\nClean exit.')
@@ -15,35 +60,60 @@ def signal_handler(sig, frame):
 
 signal.signal(signal.SIGINT, signal_handler)
 
-def handle_cookie_banner(page):
+def make_login_locators(page):
+    """Build the login page locators once per page"""
+    return SimpleNamespace(
+        # .first keeps the click non-strict like page.click() if the selector matches several buttons
+        cookie_button=page.locator(COOKIE_BANNER_SELECTOR).first,
+        password=page.locator(PASSWORD_INPUT_SELECTOR),
+        submit=page.locator(LOGIN_SUBMIT_SELECTOR)
+    )
+
+def get_creds():
+    """Read credentials.json (called once per run by run_menu)"""
+    with open(CREDENTIALS_FILE, 'rb') as f:
+        return loads(f.read())
+
+def username_from_email(email):
+    """Session username is the email prefix"""
+    return email.partition('@')[0]
+
+def handle_cookie_banner(locators, timeout=5000):
     try:
         print('Looking for cookie banner...')
-        page.wait_for_selector('button._a9--._ap36._asz1', timeout=5000)
-        page.click('button._a9--._ap36._asz1')
+        locators.cookie_button.click(timeout=timeout)
         print('✓ Cookie banner closed')
         return True
     except TimeoutError:
         print('Cookie banner not found')
         return False
 
-def perform_login(page):
+def is_login_response(response):
+    """Match the login POST, checking the cheap method first"""
+    return response.request.method == 'POST' and Endpoints.LOGIN_AJAX.search(response.url) is not None
+
+def classify_login(data):
+    """Map a login response to success, 2fa, checkpoint or failed"""
+    if data.get('authenticated') and data.get('status') == 'ok':
+        return 'success'
+    if data.get('two_factor_required'):
+        return '2fa'
+    if data.get('checkpoint_url'):
+        return 'checkpoint'
+    return 'failed'
+
+def perform_login(page, locators, creds):
     try:
-        with open('credentials.json', 'r') as f:
-            creds = json.load(f)
-        
-        print('Filling username field...')
-        page.fill('input[name="username"]', creds['email'])
-        print('✓ Username entered')
-        
-        print('Filling password field...')
-        page.fill('input[name="password"]', creds['password'])
-        print('✓ Password entered')
+        print('Filling login form...')
+        locators.password.wait_for()
+        page.evaluate(FILL_LOGIN_JS, [creds['email'], creds['password']])
+        print('✓ Username and password entered')
         
         print('Submitting login form and waiting for response...')
         
         # Professional approach: expect_response with the click
-        with page.expect_response(Endpoints.LOGIN_AJAX) as response_info:
-            page.click('#loginForm button[type="submit"]')
+        with page.expect_response(is_login_response) as response_info:
+            locators.submit.click()
         
         # Get the response
         login_response = response_info.value
@@ -51,35 +121,24 @@ def perform_login(page):
         
         # Parse response
         try:
-            data = login_response.json()
-            print('\n' + '='*50)
-            print('LOGIN RESPONSE:')
-            print(json.dumps(data, indent=2))
-            print('='*50 + '\n')
+            data = loads(login_response.body())
+            # Full response dump only when debug logging is enabled, a one-line summary otherwise
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug('LOGIN RESPONSE:\n%s', dumps(data, indent=True))
+            else:
+                print(f"  status={data.get('status')} authenticated={data.get('authenticated')}")
         except Exception as e:
             print(f'Warning: Could not parse response body: {e}')
             # Create minimal data from status
             data = {'status': 'ok' if login_response.status == 200 else 'fail', 'authenticated': login_response.status == 200}
         
-        # Check login status
-        if data.get('authenticated') and data.get('status') == 'ok':
-            print('✓ Login successful!')
-            user_id = data.get('userId')
-            if user_id:
-                print(f'  User ID: {user_id}')
-            return 'success', data
-        elif data.get('two_factor_required'):
-            print('⚠ Two-factor authentication required')
-            return '2fa', data
-        elif data.get('checkpoint_url'):
-            print('⚠ Checkpoint challenge required')
-            print(f'  Checkpoint URL: {data.get("checkpoint_url")}')
-            return 'checkpoint', data
-        else:
-            print('✗ Login failed')
-            if data.get('message'):
-                print(f'  Message: {data.get("message")}')
-            return 'failed', data
+        # Classify once, then print the matching line and its detail field
+        status = classify_login(data)
+        message, label, field = LOGIN_STATUS_INFO[status]
+        print(message)
+        if field and data.get(field):
+            print(f'  {label}: {data[field]}')
+        return status, data
             
     except TimeoutError:
         print('✗ Login timeout - no response received')
@@ -93,80 +152,159 @@ def click_post_login_button(page):
     try:
         print('\nLooking for post-login button...')
         
-        # Wait for page to stabilize after login
-        page.wait_for_timeout(2000)
-        
-        # Try specific selector first
-        button_selector = '#mount_0_0_yS > div > div > div.x9f619.x1n2onr6.x1ja2u2z > div > div > div.x78zum5.xdt5ytf.x1t2pt76.x1n2onr6.x1ja2u2z.x10cihs4 > div.html-div.xdj266r.x14z9mp.xat24cr.x1lziwak.xexx8yu.xyri2b.x18d9i69.x1c1uobl.x9f619.x16ye13r.xvbhtw8.x78zum5.x15mokao.x1ga7v0g.x16uus16.xbiv7yw.x1uhb9sk.x1plvlek.xryxfnj.x1c4vz4f.x2lah0s.x1q0g3np.xqjyukv.x1qjc9v5.x1oa3qoh.x1qughib > div.xvc5jky.xh8yej3.x10o80wk.x14k21rp.x17snn68.x6osk4m.x1porb0y.x8vgawa > section > main > div > div > section > div > button'
-        
-        button = page.query_selector(button_selector)
-        
-        if not button:
+        # Role lookup auto-waits for the button instead of sleeping and scanning a long class chain
+        try:
+            page.get_by_role('button', name=POST_LOGIN_BUTTON_RE).first.click(timeout=4000)
+        except TimeoutError:
             # Fallback to more general selector
             print('Trying general selector...')
-            button = page.query_selector('section button')
+            try:
+                page.locator(POST_LOGIN_FALLBACK_SELECTOR).first.click(timeout=2000)
+            except TimeoutError:
+                print('⚠ Button not found')
+                return False
         
-        if button:
-            print('✓ Button found! Clicking...')
-            button.click()
-            print('✓ Button clicked successfully!')
-            return True
-        else:
-            print('⚠ Button not found')
-            return False
+        print('✓ Button clicked successfully!')
+        return True
             
     except Exception as e:
         print(f'Error clicking button: {e}')
         return False
 
-def first_automation(session_manager):
-    """First automation: Login with saved session and make GraphQL request"""
+def wait_for_logged_in(page, timeout=10000):
+    """Wait until the logged-in UI shows up, returns False if it never does"""
     try:
-        # Load credentials to get username
-        with open('credentials.json', 'r') as f:
-            creds = json.load(f)
-        username = creds['email'].split('@')[0]
+        page.wait_for_selector(LOGGED_IN_SELECTOR, timeout=timeout)
+        return True
+    except TimeoutError:
+        return False
+
+def ask(message, default, batch=False):
+    """input() interactively; in batch mode show the prompt and answer with the default"""
+    if batch:
+        print(f'{message}{default} [batch]')
+        return default
+    return input(message)
+
+def wait_for_browser_step(page, batch=False, timeout=120000):
+    """Wait for a step finished by hand in the browser (2FA, checkpoint)
+    
+    Interactively the user presses Enter; in batch mode there is no console,
+    so wait for the logged-in UI instead.
+    """
+    if not batch:
+        input('Press Enter when done...')
+        return
+    print(f'[batch] Waiting up to {timeout // 1000}s for the step to be completed in the browser...')
+    if not wait_for_logged_in(page, timeout=timeout):
+        print('⚠ Still not logged in, saving the session as it is')
+
+def fresh_login(page, context, session_manager, username, creds, batch=False):
+    """Log in through the login form and save the resulting session"""
+    # Set up GraphQL interceptor
+    interceptor = GraphQLInterceptor()
+    interceptor.setup_interception(page)
+    
+    print('Navigating to Instagram login...')
+    page.goto(Endpoints.LOGIN_PAGE)
+    
+    locators = make_login_locators(page)
+    # Saved state already carries the cookie consent, so only glance for the banner
+    handle_cookie_banner(locators, timeout=500 if session_manager.has_saved_session(username) else 5000)
+    
+    # Perform login and get result
+    login_status, response_data = perform_login(page, locators, creds)
+    
+    if login_status == 'success':
+        # Try to click the post-login button
+        click_post_login_button(page)
         
-        # Check if we have a saved session
-        if not session_manager.has_saved_session(username):
-            print("No saved session found. Please login first (option 1)")
-            return
+        # Return as soon as the profile query has been captured
+        print('\nCapturing GraphQL metadata...')
+        if not interceptor.wait_for_endpoints(page, timeout=5000):
+            print('⚠ Profile query not captured, saving what was seen')
         
-        from playwright.sync_api import sync_playwright
+        # Get captured GraphQL data
+        graphql_data = interceptor.get_session_data()
         
-        with sync_playwright() as p:
-            print('Starting browser with saved session...')
-            browser = p.chromium.launch(headless=False)
-            
-            # Create context with saved session
-            context = session_manager.create_browser_context(browser, username)
-            page = context.new_page()
-            
+        # Save the session state with GraphQL data
+        print('\nSaving session for future use...')
+        session_manager.save_context_state(context, username, graphql_data)
+        
+        print('\nLogin successful! Session saved.')
+        
+    elif login_status == '2fa':
+        print('\nPlease complete 2FA in the browser')
+        wait_for_browser_step(page, batch)
+        # Get captured GraphQL data after 2FA
+        graphql_data = interceptor.get_session_data()
+        # Save session after 2FA
+        session_manager.save_context_state(context, username, graphql_data)
+        
+    elif login_status == 'checkpoint':
+        print('\nPlease complete the checkpoint challenge in the browser')
+        wait_for_browser_step(page, batch)
+        # Get captured GraphQL data after checkpoint
+        graphql_data = interceptor.get_session_data()
+        # Save session after checkpoint
+        session_manager.save_context_state(context, username, graphql_data)
+        
+    else:
+        print('\nLogin was not successful')
+        if not batch:
+            input('Press Enter to close browser...')
+
+@contextmanager
+def logged_in_page(session_manager, context_pool, username):
+    """Get the account's page on its saved session, landed on Instagram
+    
+    Yields (context, page, logged_in), or None when no session is saved.
+    The page stays open for the next action; a page used in the last minute
+    that is still on Instagram is reused without navigating again.
+    """
+    if not session_manager.has_saved_session(username):
+        print("No saved session found. Please login first (option 1)")
+        yield None
+        return
+    
+    # Reuse this account's context and page if an earlier action already opened them
+    context, page, recent = context_pool.get_page(username)
+    try:
+        if recent and page.url.startswith(Endpoints.BASE_URL):
+            print('Reusing Instagram page from the previous action')
+            logged_in = True
+        else:
             print('Loading Instagram...')
             page.goto(Endpoints.BASE_URL, wait_until='domcontentloaded')
-            page.wait_for_timeout(3000)
+            # Returns as soon as the logged-in UI hydrates
+            logged_in = wait_for_logged_in(page, timeout=5000)
+        yield context, page, logged_in
+    finally:
+        context_pool.touch(username)
+
+def first_automation(session_manager, context_pool, username):
+    """First automation: Login with saved session and make GraphQL request"""
+    try:
+        with logged_in_page(session_manager, context_pool, username) as session:
+            if not session:
+                return
+            context, page, logged_in = session
             
             # Check if logged in
-            if not (page.query_selector('svg[aria-label="Profile"]') or page.query_selector('span[role="link"][tabindex="0"]')):
+            if not logged_in:
                 print("Session expired. Please login again (option 1)")
-                context.close()
-                browser.close()
+                context_pool.discard(username)
+                session_manager.clear_response_caches(username)
                 return
             
             print('✓ Logged in successfully with saved session!')
             
-            # Get user ID from saved session
-            cookies = context.cookies()
-            user_id = None
-            for cookie in cookies:
-                if cookie['name'] == 'ds_user_id':
-                    user_id = cookie['value']
-                    break
+            # Get user ID from saved session (only Instagram's cookies are requested)
+            user_id = next((c['value'] for c in context.cookies(Endpoints.BASE_URL) if c['name'] == 'ds_user_id'), None)
             
             if not user_id:
                 print("Could not find user ID in cookies")
-                context.close()
-                browser.close()
+                context_pool.discard(username)
                 return
             
             print(f'User ID from cookies: {user_id}')
@@ -183,7 +321,8 @@ def first_automation(session_manager):
             print('EXECUTING GRAPHQL REQUEST')
             print('='*50)
             
-            graphql_client = GraphQLClient(page, graphql_metadata)
+            # Repeat runs within the TTL reuse the last profile response, across restarts too
+            graphql_client = GraphQLClient(page, graphql_metadata, cache=session_manager.get_graphql_cache(username))
             response_data = graphql_client.get_profile_info(user_id)
             
             if response_data:
@@ -214,42 +353,19 @@ def first_automation(session_manager):
             else:
                 print('✗ GraphQL request failed')
             
-            print('\nWaiting 10 seconds before closing...')
-            page.wait_for_timeout(10000)
-            
-            context.close()
-            browser.close()
-            print('Browser closed')
-            
     except Exception as e:
         print(f'Error in first_automation: {e}')
 
-def scrape_following(session_manager):
+def scrape_following(session_manager, context_pool, username, batch=False):
     """Scrape following list"""
+    # Scrapers are only imported by the actions that use them
+    from ig_scraper.scrapers.following import FollowingScraper
+    
     try:
-        # Load credentials to get username
-        with open('credentials.json', 'r') as f:
-            creds = json.load(f)
-        username = creds['email'].split('@')[0]
-        
-        # Check if we have a saved session
-        if not session_manager.has_saved_session(username):
-            print("No saved session found. Please login first (option 1)")
-            return
-        
-        from playwright.sync_api import sync_playwright
-        
-        with sync_playwright() as p:
-            print('Starting browser with saved session...')
-            browser = p.chromium.launch(headless=False)
-            
-            # Create context with saved session
-            context = session_manager.create_browser_context(browser, username)
-            page = context.new_page()
-            
-            print('Loading Instagram...')
-            page.goto(Endpoints.BASE_URL, wait_until='domcontentloaded')
-            page.wait_for_timeout(3000)
+        with logged_in_page(session_manager, context_pool, username) as session:
+            if not session:
+                return
+            _, page, _ = session
             
             # Create following scraper
             scraper = FollowingScraper(page, session_manager, username)
@@ -257,12 +373,11 @@ def scrape_following(session_manager):
             # Verify login with GraphQL test
             if not scraper.verify_login_with_graphql():
                 print("\n✗ Login verification failed. Please login again (option 1)")
-                context.close()
-                browser.close()
+                context_pool.discard(username)
+                session_manager.clear_response_caches(username)
                 return
             
             print("\n✓ Login verified! Proceeding with following scrape...")
-            page.wait_for_timeout(2000)
             
             # Get following list
             following_data = scraper.get_following(count=12)
@@ -274,237 +389,228 @@ def scrape_following(session_manager):
                 # Check if there are more pages
                 if following_data.get('next_max_id'):
                     print("\n" + "="*50)
-                    choice = input("Load more following? (y/n): ")
-                    if choice.lower() == 'y':
+                    choice = ask("Load more following? (y/n/a = all remaining): ", 'n', batch).lower()
+                    next_data = None
+                    if choice in ('y', 'a'):
                         # Get next page
                         print("\nFetching next page...")
                         next_data = scraper.get_following(count=12, max_id=following_data['next_max_id'])
                         if next_data:
                             scraper.display_following(next_data)
+                        else:
+                            print("✗ Failed to get next page")
+                    
+                    # Bulk mode: fetch the rest back-to-back without further prompts. get_following_all
+                    # prints a summary line per page, full listings only with debug logging
+                    if choice == 'a' and next_data and next_data.get('next_max_id'):
+                        pages = scraper.get_following_all(count=12, max_pages=AUTO_PAGINATE_MAX_PAGES,
+                                                          max_id=next_data['next_max_id'])
+                        if log.isEnabledFor(logging.DEBUG):
+                            for page_data in pages:
+                                scraper.display_following(page_data)
             else:
                 print("✗ Failed to get following list")
             
-            print('\nWaiting 10 seconds before closing...')
-            page.wait_for_timeout(10000)
-            
-            context.close()
-            browser.close()
-            print('Browser closed')
-            
     except Exception as e:
         print(f'Error in scrape_following: {e}')
 
-def scrape_explore(session_manager):
+def scrape_explore(session_manager, context_pool, username, query=None, batch=False):
     """Scrape explore/search results"""
+    from ig_scraper.scrapers.explore import ExploreScraper
+    
     try:
-        # Load credentials to get username
-        with open('credentials.json', 'r') as f:
-            creds = json.load(f)
-        username = creds['email'].split('@')[0]
-        
-        # Check if we have a saved session
-        if not session_manager.has_saved_session(username):
-            print("No saved session found. Please login first (option 1)")
-            return
-        
-        from playwright.sync_api import sync_playwright
-        
-        with sync_playwright() as p:
-            print('Starting browser with saved session...')
-            browser = p.chromium.launch(headless=False)
-            
-            # Create context with saved session
-            context = session_manager.create_browser_context(browser, username)
-            page = context.new_page()
-            
-            print('Loading Instagram...')
-            page.goto(Endpoints.BASE_URL, wait_until='domcontentloaded')
-            page.wait_for_timeout(3000)
+        with logged_in_page(session_manager, context_pool, username) as session:
+            if not session:
+                return
+            _, page, _ = session
             
             # Create explore scraper
             scraper = ExploreScraper(page, session_manager, username)
             
-            # Verify login with GraphQL test
-            if not scraper.verify_login_with_graphql():
-                print("\n✗ Login verification failed. Please login again (option 1)")
-                context.close()
-                browser.close()
-                return
-            
-            print("\n✓ Login verified! Ready for explore search...")
-            
-            # Get search query from user
-            query = input("\nEnter search query (e.g. 'news', 'tech', 'food'): ").strip()
-            if not query:
-                print("No query provided, using default: 'news'")
-                query = "news"
-            
-            # Perform initial search
-            explore_data = scraper.search_explore(query)
-            
-            if not explore_data:
-                print("✗ Failed to get explore results")
-            else:
-                # Display the results
-                scraper.display_results(explore_data)
+            try:
+                # Verify login with GraphQL test
+                if not scraper.verify_login_with_graphql():
+                    print("\n✗ Login verification failed. Please login again (option 1)")
+                    context_pool.discard(username)
+                    session_manager.clear_response_caches(username)
+                    return
                 
-                # Pagination loop
-                page_count = 1
-                while True:
-                    # Check if there are more results (in root or media_grid)
-                    next_max_id = explore_data.get('next_max_id') or explore_data.get('media_grid', {}).get('next_max_id')
-                    if not next_max_id:
-                        print("\n✓ No more pages available")
-                        break
-                    
-                    print("\n" + "="*50)
-                    choice = input(f"Load more results? (Page {page_count + 1}) (y/n): ")
-                    if choice.lower() != 'y':
-                        print("✓ Stopped pagination by user")
-                        break
-                    
-                    # Get next page
-                    print(f"\nFetching page {page_count + 1}...")
-                    explore_data = scraper.search_explore(query, next_max_id=next_max_id)
-                    
-                    if not explore_data:
-                        print("✗ Failed to get next page")
-                        break
-                    
-                    # Display the new results
+                print("\n✓ Login verified! Ready for explore search...")
+                
+                # Get search query from user, unless given (batch line '6:QUERY')
+                if query is None:
+                    query = ask("\nEnter search query (e.g. 'news', 'tech', 'food'): ", '', batch).strip()
+                if not query:
+                    print("No query provided, using default: 'news'")
+                    query = "news"
+                
+                # Perform initial search
+                explore_data = scraper.search_explore(query)
+                
+                if not explore_data:
+                    print("✗ Failed to get explore results")
+                else:
+                    # Display the results
                     scraper.display_results(explore_data)
-                    page_count += 1
                     
-                print(f"\n✓ Total pages loaded: {page_count}")
+                    # Pagination loop
+                    page_count = 1
+                    while True:
+                        next_max_id = scraper.get_next_max_id(explore_data)
+                        if not next_max_id:
+                            print("\n✓ No more pages available")
+                            break
+                        
+                        print("\n" + "="*50)
+                        choice = ask(f"Load more results? (Page {page_count + 1}) (y/n/a = all remaining): ", 'n', batch).lower()
+                        if choice == 'a':
+                            # Bulk mode: the rest is fetched paced and capped, without further prompts
+                            for page_data in scraper.search_explore_all(query, max_pages=AUTO_PAGINATE_MAX_PAGES,
+                                                                        next_max_id=next_max_id):
+                                scraper.display_results(page_data)
+                                page_count += 1
+                            break
+                        if choice != 'y':
+                            print("✓ Stopped pagination by user")
+                            break
+                        
+                        # Get next page
+                        print(f"\nFetching page {page_count + 1}...")
+                        explore_data = scraper.search_explore(query, next_max_id=next_max_id)
+                        
+                        if not explore_data:
+                            print("✗ Failed to get next page")
+                            break
+                        
+                        # Display the new results
+                        scraper.display_results(explore_data)
+                        page_count += 1
+                        
+                    print(f"\n✓ Total pages loaded: {page_count}")
+            finally:
+                # Wait for queued data files to be written
+                scraper.close()
             
-            print('\nWaiting 10 seconds before closing...')
-            page.wait_for_timeout(10000)
+    except Exception as e:
+        print(f'Error in scrape_explore: {e}')
+
+def login(session_manager, browser_manager, context_pool, username, creds, resume=False, batch=False):
+    """Menu 1/2: log in, reusing the saved session first when resume is set"""
+    try:
+        browser = browser_manager.get_browser()
+        
+        # Create context with storage state
+        context = session_manager.create_browser_context(browser, username)
+        try:
+            # Not routed: 2FA and checkpoint pages must keep loading (captcha images included)
+            # while the console waits on input()
+            page = context.new_page()
             
+            # Check if we need to login
+            if resume and session_manager.has_saved_session(username):
+                print('Using saved session, checking if still logged in...')
+                page.goto(Endpoints.BASE_URL, wait_until='domcontentloaded')
+                
+                # Check if we're logged in by waiting for the profile icon or login button
+                if wait_for_logged_in(page):
+                    print('✓ Still logged in with saved session!')
+                else:
+                    print('Session expired, need to login again')
+                    fresh_login(page, context, session_manager, username, creds, batch)
+            elif not resume:
+                fresh_login(page, context, session_manager, username, creds, batch)
+        finally:
+            # Closed on failures too, the shared browser outlives this action
             context.close()
-            browser.close()
-            print('Browser closed')
+            print('Context closed')
+            
+            # Pooled contexts for this account still hold the old session
+            context_pool.discard(username)
             
     except Exception as e:
-        print(f'Error in scrape_explore: {e}')
+        print(f'Error: {e}')
+
+def clear_saved_session(session_manager, context_pool, username):
+    """Menu 3: drop the account's pooled context and saved session files"""
+    try:
+        context_pool.discard(username)
+        session_manager.clear_session(username)
+    except Exception as e:
+        print(f'Error clearing session: {e}')
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Instagram scraper')
+    parser.add_argument('--batch', metavar='FILE',
+                        help='run menu choices from FILE (one per line, e.g. 2, 5, 6:news) against one warm browser '
+                             'without prompting, then exit')
+    return parser.parse_args()
+
+def read_batch(path):
+    """Menu choices from a batch file, skipping blank lines and # comments"""
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
 
 def main():
+    args = parse_args()
+    
+    # Verbose debug output is opt-in: IG_LOG_LEVEL=DEBUG python main.py
+    level_name = os.environ.get('IG_LOG_LEVEL', 'INFO').upper()
+    level = getattr(logging, level_name, None)
+    if not isinstance(level, int):
+        print(f'⚠ Unknown IG_LOG_LEVEL {level_name!r}, using INFO')
+        level = logging.INFO
+    logging.basicConfig(level=level, format='[%(levelname)s] %(message)s')
+    
     session_manager = SessionManager()
+    # One browser for the whole run, with one pooled context per account
+    browser_manager = BrowserManager()
+    context_pool = ContextPool(browser_manager, session_manager)
+    
+    try:
+        choices = read_batch(args.batch) if args.batch else None
+        run_menu(session_manager, browser_manager, context_pool, choices)
+    finally:
+        context_pool.close_all()
+        browser_manager.shutdown()
+
+def run_menu(session_manager, browser_manager, context_pool, choices=None):
+    """Interactive menu loop, or run the given choices back-to-back and exit"""
+    # Every action works on the same account, so load its credentials once
+    try:
+        creds = get_creds()
+    except FileNotFoundError:
+        print('Error: credentials.json not found')
+        return
+    username = username_from_email(creds['email'])
+    # Batch runs never block on input(), prompts inside the actions take their defaults
+    batch = choices is not None
     
+    actions = {
+        '1': partial(login, session_manager, browser_manager, context_pool, username, creds, resume=False, batch=batch),
+        '2': partial(login, session_manager, browser_manager, context_pool, username, creds, resume=True, batch=batch),
+        '3': partial(clear_saved_session, session_manager, context_pool, username),
+        '4': partial(first_automation, session_manager, context_pool, username),
+        '5': partial(scrape_following, session_manager, context_pool, username, batch=batch),
+        '6': partial(scrape_explore, session_manager, context_pool, username, batch=batch),
+    }
+    
+    pending = iter(choices) if choices is not None else None
     while True:
-        choice = input('\n1: Login\n2: Login with saved session\n3: Clear saved sessions\n4: First Automation (GraphQL test)\n5: Scrape Following\n6: Explore Search\n0: Exit\n> ')
+        if pending is None:
+            choice = input(MENU_PROMPT)
+        else:
+            choice = next(pending, '0')
+            print(f'\n[batch] > {choice}')
+        # Explore takes its query after a colon, e.g. '6:news'
+        choice, _, query = choice.partition(':')
         if choice == '0':
             break
-            
-        elif choice in ['1', '2']:
-            try:
-                # Load credentials
-                with open('credentials.json', 'r') as f:
-                    creds = json.load(f)
-                username = creds['email'].split('@')[0]  # Use email prefix as username
-                
-                with sync_playwright() as p:
-                    print('Starting browser...')
-                    browser = p.chromium.launch(headless=False)
-                    
-                    # Create context with storage state
-                    context = session_manager.create_browser_context(browser, username)
-                    page = context.new_page()
-                    
-                    # Check if we need to login
-                    if choice == '2' and session_manager.has_saved_session(username):
-                        print('Using saved session, checking if still logged in...')
-                        page.goto(Endpoints.BASE_URL)
-                        page.wait_for_timeout(3000)
-                        
-                        # Check if we're logged in by looking for profile icon or login button
-                        if page.query_selector('svg[aria-label="Profile"]') or page.query_selector('span[role="link"][tabindex="0"]'):
-                            print('✓ Still logged in with saved session!')
-                            print('\nSession active! Waiting 30 seconds...')
-                            page.wait_for_timeout(30000)
-                        else:
-                            print('Session expired, need to login again')
-                            choice = '1'  # Force fresh login
-                    
-                    if choice == '1':
-                        # Set up GraphQL interceptor
-                        interceptor = GraphQLInterceptor()
-                        interceptor.setup_interception(page)
-                        
-                        print('Navigating to Instagram login...')
-                        page.goto(Endpoints.LOGIN_PAGE)
-                        
-                        handle_cookie_banner(page)
-                        page.wait_for_timeout(1000)
-                        
-                        # Perform login and get result
-                        login_status, response_data = perform_login(page)
-                        
-                        if login_status == 'success':
-                            # Try to click the post-login button
-                            click_post_login_button(page)
-                            
-                            # Wait a bit for more GraphQL requests to be captured
-                            print('\nCapturing GraphQL metadata...')
-                            page.wait_for_timeout(3000)
-                            
-                            # Get captured GraphQL data
-                            graphql_data = interceptor.get_session_data()
-                            
-                            # Save the session state with GraphQL data
-                            print('\nSaving session for future use...')
-                            session_manager.save_context_state(context, username, graphql_data)
-                            
-                            # Wait a bit
-                            print('\nLogin successful! Session saved.')
-                            print('Waiting 10 seconds before closing...')
-                            page.wait_for_timeout(10000)
-                            
-                        elif login_status == '2fa':
-                            print('\nPlease complete 2FA in the browser')
-                            input('Press Enter when done...')
-                            # Get captured GraphQL data after 2FA
-                            graphql_data = interceptor.get_session_data()
-                            # Save session after 2FA
-                            session_manager.save_context_state(context, username, graphql_data)
-                            
-                        elif login_status == 'checkpoint':
-                            print('\nPlease complete the checkpoint challenge in the browser')
-                            input('Press Enter when done...')
-                            # Get captured GraphQL data after checkpoint
-                            graphql_data = interceptor.get_session_data()
-                            # Save session after checkpoint
-                            session_manager.save_context_state(context, username, graphql_data)
-                            
-                        else:
-                            print('\nLogin was not successful')
-                            input('Press Enter to close browser...')
-                    
-                    context.close()
-                    browser.close()
-                    print('Browser closed')
-                    
-            except FileNotFoundError:
-                print('Error: credentials.json not found')
-            except Exception as e:
-                print(f'Error: {e}')
-                
-        elif choice == '3':
-            try:
-                with open('credentials.json', 'r') as f:
-                    creds = json.load(f)
-                username = creds['email'].split('@')[0]
-                session_manager.clear_session(username)
-            except Exception as e:
-                print(f'Error clearing session: {e}')
-                
-        elif choice == '4':
-            first_automation(session_manager)
-            
-        elif choice == '5':
-            scrape_following(session_manager)
-            
-        elif choice == '6':
-            scrape_explore(session_manager)
+        
+        action = actions.get(choice)
+        if action and query and choice == '6':
+            action(query=query)
+        elif action:
+            action()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file